@@ -41,7 +41,7 @@ class ScanDelegate(DefaultDelegate):
 
     def handleDiscovery(self, dev, isNewDev, isNewData):
         if isNewDev:
-            log_info(f"Discovered device: {dev.addr}")
+            log_info("Discovered device: %s", dev.addr)
 
 def connect_with_retry(dev, addr_type, retries=3, delay=1):
     for _ in range(retries):
@@ -49,7 +49,7 @@ def connect_with_retry(dev, addr_type, retries=3, delay=1):
             peripheral = Peripheral(dev.addr, addr_type)
             return peripheral
         except Exception as e:
-            log_error(f"Error connecting to {dev.addr}: {e}")
+            log_error("Error connecting to %s: %s", dev.addr, e)
             time.sleep(delay)
     return None
 
@@ -60,22 +60,22 @@ devices = scanner.scan(10.0)
 # Find your iPhone
 iphone_dev = None
 for dev in devices:
-    log_info(f"Device {dev.addr} ({dev.addrType}), RSSI={dev.rssi} dB")
+    log_info("Device %s (%s), RSSI=%s dB", dev.addr, dev.addrType, dev.rssi)
     for (adtype, desc, value) in dev.getScanData():
-        log_info(f"  {desc} = {value}")
+        log_info("  %s = %s", desc, value)
     if "iPhone" in dev.getValueText(9) or "iPhone" in str(dev.getScanData()):  # Check device name
         iphone_dev = dev
         log_info("Found iPhone!")
 
 if iphone_dev:
-    log_info(f"Connecting to {iphone_dev.addr}...")
+    log_info("Connecting to %s...", iphone_dev.addr)
     peripheral = connect_with_retry(iphone_dev, iphone_dev.addrType)
     if peripheral:
         try:
             # Discover services
             services = peripheral.getServices()
         except Exception as e:
-            log_error(f"Error: {e}")
+            log_error("Error: %s", e)
         finally:
             peripheral.disconnect()
     else:
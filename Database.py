@@ -138,13 +138,27 @@ class Database:
 
     def setup_engine_sounds_tables(self):
         """ Prepopulate EngineSoundTable with free engine sounds from VEHICLE_ASSETS
+            Same insert or update behavior as insert_engine_sounds_table(), but batched into one transaction
         """
         try:
-            # Use VEHICLE_ASSETS to populate the engine sounds table
-            for asset in GC.VEHICLE_ASSETS:
-                now = datetime.now().isoformat() #2025-01-30T13:13:13.123456
-                # Use the engineSoundID as the filename identifier
-                self.insert_engine_sounds_table(asset.sound, 0, now)
+            tableName = GC.DATABASE_TABLE_NAMES[GC.ENGINE_SOUNDS_TABLE]
+            now = datetime.now().isoformat() #2025-01-30T13:13:13.123456
+
+            # One SELECT replaces a get_engine_sounds() lookup per asset, keeping the lowest id like that lookup did
+            self.cursor.execute(f"SELECT id, filename FROM {tableName} ORDER BY id")
+            existingIds = {}
+            for idPrimaryKey, filename in self.cursor.fetchall():
+                existingIds.setdefault(filename, idPrimaryKey)
+
+            # Use the engineSoundID as the filename identifier, dict.fromkeys() drops duplicate sounds but keeps order
+            sounds = dict.fromkeys(asset.sound for asset in GC.VEHICLE_ASSETS)
+            updateRows = [(sound, 0, existingIds[sound]) for sound in sounds if sound in existingIds]
+            insertRows = [(sound, 0, now) for sound in sounds if sound not in existingIds]
+
+            # executemany() reuses each prepared statement and the connection context manager commits once (or rolls back)
+            with self.conn:
+                self.cursor.executemany(f"UPDATE {tableName} SET filename = ?, cost_in_cents = ? WHERE id = ?", updateRows)
+                self.cursor.executemany(f"INSERT INTO {tableName} (filename, cost_in_cents, timestamp) VALUES (?, ?, ?)", insertRows)
         except Exception as e:
             print(f"Error in setup_engine_sounds_tables: {e}")
 
@@ -5,6 +5,7 @@ Create pitch varying audio of a library of cars in real-time on low processing p
 
 import os
 import time
+from types import MappingProxyType
 from logging_utils import log_info, log_warning
 import simpleaudio as sa
 
@@ -21,6 +22,17 @@ class EngineSoundGenerator:
     ford_model_t = "ford_model_t.wav"
     ford_mustang_gt350 = "ford_mustang_gt350.wav"
 
+    # Sound filename -> engine sound ID, read-only
+    engine_sounds_dict = MappingProxyType({
+        mc_laren_f1: 0,
+        la_ferrari: 1,
+        porcshe_911: 2,
+        bmw_m4: 3,
+        jaguar_e_type_series_1: 4,
+        ford_model_t: 5,
+        ford_mustang_gt350: 6
+    })
+
     def __init__(self, base_audio):
         """
         Initialize the EngineSoundGenerator.
@@ -28,15 +40,6 @@ class EngineSoundGenerator:
         Args:
             base_audio (str): The filename of the base audio to use.
         """
-        self.engine_sounds_dict = {
-            self.mc_laren_f1: 0,
-            self.la_ferrari: 1,
-            self.porcshe_911: 2,
-            self.bmw_m4: 3,
-            self.jaguar_e_type_series_1: 4,
-            self.ford_model_t: 5,
-            self.ford_mustang_gt350: 6
-        }
         self.set_engine_sound(base_audio)
 
     def start_audio(self):
@@ -75,9 +78,9 @@ class EngineSoundGenerator:
             path_ending = os.path.join("./Sounds", new_sound)
             self.base_audio_filename = new_sound
             self.engine_sound_wave_object = sa.WaveObject.from_wave_file(path_ending)
-            log_info(f"Engine sound changed to {new_sound}")
+            log_info("Engine sound changed to %s", new_sound)
         else:
-            log_warning(f"WARNING: New sound '{new_sound}' was NOT set. Keeping sound set to {self.base_audio_filename}")
+            log_warning("WARNING: New sound '%s' was NOT set. Keeping sound set to %s", new_sound, self.base_audio_filename)
 
     def get_base_audio_filename(self):
         """
@@ -11,22 +11,24 @@ __doc__        = "Create pitch varying audio in real-time on low processing powe
 # Disable PyLint linting messages that seem unuseful
 # https://pypi.org/project/pylint/
 # pylint: disable=invalid-name
-# pylint: disable=global-statement
 
 ## Standard Python libraries
-from time import sleep # https://docs.python.org/3/library/time.html
 import os              # https://docs.python.org/3/library/os.html
+import threading       # https://docs.python.org/3/library/threading.html
 
 ## 3rd party libraries
 try:
-    # Audio analysis, with building blocks necessary to create music information retrieval systems
-    # https://librosa.org/doc/latest/index.html
-    import librosa
+    # Scientific computing with fast N-dimensional arrays
+    # https://numpy.org/doc/stable/
+    import numpy as np
+
+    # Read WAV files straight into NumPy arrays via libsndfile
+    # https://python-soundfile.readthedocs.io/
+    import soundfile as sf
 
     # Play and record NumPy arrays containing audio signals.
     # https://python-sounddevice.readthedocs.io/
     import sounddevice as sd
-    import numpy as np
 
     # Control and monitor input devices (mouse & keyboard)
     # https://pypi.org/project/pynput/
@@ -39,12 +41,127 @@ except ImportError :
     print("python3 -m venv .venvDMuffler")
     print("source .venvDMuffler/bin/activate")
 
+try:
+    # JIT compile numeric Python loops to machine code
+    # https://numba.readthedocs.io/
+    from numba import njit
+
+except ImportError:
+    # Numba is optional, without it the resampler below falls back to NumPy vectorized code
+    njit = None
+
 ## Internal libraries
 import GlobalConstants as GC
 
+# Directory holding this file, audio paths in GlobalConstants are relative to it
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Decoded (audioTimeSeries, sampleRate) for each audio filepath, shared read only by every EngineSoundPitchShifter
+_PCM_CACHE = {}
+
+
+def _get_pcm(audioFilepath: str):
+    """ Decode an audio file once, then return the cached copy on every later call
+
+    Args:
+        audioFilepath (str): Filepath of the audio clip to decode
+
+    Returns:
+        tuple: (audioTimeSeries, sampleRate) with audioTimeSeries a mono float32 numpy.ndarray
+    """
+    if audioFilepath not in _PCM_CACHE:
+        with sf.SoundFile(audioFilepath) as audioFile:
+            sampleRate = audioFile.samplerate
+            audioTimeSeries = np.empty(audioFile.frames, dtype=np.float32)
+
+            if audioFile.channels == 1:
+                # Decode straight into the cached array, read() returns it trimmed to the frames actually decoded
+                audioTimeSeries = audioFile.read(dtype='float32', out=audioTimeSeries)
+            else:
+                # Mix down to the single channel OutputStream plays one block at a time,
+                # so the full multi-channel clip is never resident in memory
+                position = 0
+                for block in audioFile.blocks(blocksize=GC.AUDIO_DECODE_BLOCK_SIZE, dtype='float32', always_2d=True):
+                    audioTimeSeries[position:position + len(block)] = block.mean(axis=1)
+                    position += len(block)
+
+                # The header frame count can overstate what libsndfile delivers, never cache the uninitialised tail
+                audioTimeSeries = audioTimeSeries[:position]
+
+        _PCM_CACHE[audioFilepath] = (audioTimeSeries, sampleRate)
+
+    return _PCM_CACHE[audioFilepath]
+
+
+def _resample_block_loop(audio, out, startFrame, pitch):
+    """ Fill an output block by reading audio at pitch times normal speed, linearly interpolating between samples
+        Written as a per-sample loop for Numba to compile, far too slow to run as plain Python in the audio callback
+
+    Args:
+        audio (numpy.ndarray): Mono time series of audio data
+        out (numpy.ndarray): Output block to fill, zero padded once audio runs out
+        startFrame (float): Fractional frame of audio to start reading from
+        pitch (float): Playback speed, where 2.0 plays one octave higher
+
+    Returns:
+        float: Fractional frame of audio the next block starts reading from
+    """
+    lastFrame = len(audio) - 1
+    position = startFrame
+    for i in range(len(out)):
+        index = int(position)
+        if index < lastFrame:
+            fraction = position - index
+            out[i] = audio[index] + fraction * (audio[index + 1] - audio[index])
+        elif index == lastFrame:
+            out[i] = audio[index]
+        else:
+            out[i] = 0.0
+        position += pitch
+
+    return position
+
+
+# Sample offsets within one audio block
+_FRAME_RAMP = np.arange(GC.AUDIO_BLOCK_SIZE, dtype=np.float64)
+
+
+def _resample_block_numpy(audio, out, startFrame, pitch):
+    """ Same interpolation as _resample_block_loop(), vectorized with NumPy so the per-sample work runs in C
+
+    Args:
+        audio (numpy.ndarray): Mono time series of audio data
+        out (numpy.ndarray): Output block to fill, zero padded once audio runs out
+        startFrame (float): Fractional frame of audio to start reading from
+        pitch (float): Playback speed, where 2.0 plays one octave higher
+
+    Returns:
+        float: Fractional frame of audio the next block starts reading from
+    """
+    frames = len(out)
+    ramp = _FRAME_RAMP[:frames] if frames <= len(_FRAME_RAMP) else np.arange(frames, dtype=np.float64)
+    positions = startFrame + ramp * pitch
+
+    # Clamp to the final sample, then silence every position past the end of audio
+    lastFrame = len(audio) - 1
+    index = np.minimum(positions.astype(np.intp), lastFrame)
+    nextIndex = np.minimum(index + 1, lastFrame)
+    fraction = positions - index
+    out[:] = audio[index] + fraction * (audio[nextIndex] - audio[index])
+    out[positions >= lastFrame + 1] = 0.0
+
+    return startFrame + frames * pitch
+
+
+if njit is not None:
+    _resample_block = njit(cache=True, fastmath=True, boundscheck=False)(_resample_block_loop)
+else:
+    _resample_block = _resample_block_numpy
+
+
 class EngineSoundPitchShifter:
 
-    # Global variables for keyboard input (to simulate gas pedal of a vehicle)
+    # Keyboard input state (to simulate gas pedal of a vehicle), set per instance by on_press() and on_release()
     isWPressed = False
     isEscPressed = False
 
@@ -59,36 +176,39 @@ class EngineSoundPitchShifter:
         Object instance variables:
             audioFilepath (str): Relative filepath of baseAudio audio clip
             audioTimeSeries (numpy.ndarray): Time series of audio data
-            sampleRate (int): Sample rate of audio data
+            sampleRate (int): Native sample rate of the audio file, OutputStream plays at this rate so audio is never resampled
             playing (Bool): Flag to indicate if audio is currently playing
-            currentFrame (int): Current frame of audio playback
+            currentFrame (float): Current fractional frame of audio playback
             pitchFactor (float): Factor to modulate pitch of audio playback
-            running (Bool): Flag to indicate if audio is currently running
+            stopEvent (Event): Set by cleanup() to stop the gas pedal simulation loop
             stream (Stream): Stream object for audio playback
 
         Returns:
             New EngineSoundPitchShifter() object
         """
         # Load audio file
-        EngineSoundPitchShifterPyDirectory = os.path.dirname(os.path.abspath(__file__))
-        self.audioFilepath = os.path.join(EngineSoundPitchShifterPyDirectory, GC.VEHICLE_ASSETS[int(baseAudioID)].sound)
-        self.audioTimeSeries, self.sampleRate = librosa.load(self.audioFilepath)
+        self.audioFilepath = os.path.join(_MODULE_DIR, GC.VEHICLE_ASSETS[int(baseAudioID)].sound)
+        self.audioTimeSeries, self.sampleRate = _get_pcm(self.audioFilepath)
 
         # Initialize playback variables
         self.playing = False
-        self.currentFrame = 0
+        self.currentFrame = 0.0
         self.pitchFactor = 1.0
+        self.stopEvent = threading.Event()
+
+        # Pay the one time JIT compile here, instead of inside the first audio callback
+        _resample_block(np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32), 0.0, 1.0)
 
         # Setup audio stream using sounddevice library
         try:
-            self.stream = sd.OutputStream(channels=1, samplerate=self.sampleRate, callback=self.audio_callback)
+            # Large blocks mean fewer Python callbacks per second, so each one has more time before an underrun
+            # float32 matches audioTimeSeries, so _resample_block writes into outdata without any conversion or scratch buffer
+            self.stream = sd.OutputStream(channels=1, samplerate=self.sampleRate, blocksize=GC.AUDIO_BLOCK_SIZE, dtype='float32', callback=self.audio_callback)
         except NameError:
             peek("Sounddevice object is not defined", color="red")
         else:
             self.stream.start()
         finally:
-            self.running = True
-
             # Start the stream
             self.stream.start()
 
@@ -100,40 +220,21 @@ class EngineSoundPitchShifter:
             self.stream.stop()
             self.stream.close()
 
-        self.running = False
+        self.stopEvent.set()
 
 
     def audio_callback(self, outdata, frames, time, status):
         if self.playing and self.currentFrame < len(self.audioTimeSeries):
-            # Get chunk of audio
-            chunk = self.audioTimeSeries[self.currentFrame:self.currentFrame + frames]
-
-            # Apply pitch shift
-            if len(chunk) > 0:
-                shifted = librosa.effects.pitch_shift(
-                    chunk,
-                    sr=self.sampleRate,
-                    n_steps=12 * np.log2(self.pitchFactor)
-                )
-
-                # Ensure the output array is the right size
-                if len(shifted) < frames:
-                    shifted = np.pad(shifted, (0, frames - len(shifted)))
-
-                outdata[:] = shifted.reshape(-1, 1)
-                self.currentFrame += frames
-            else:
-                outdata.fill(0)
+            # Resampling speeds the engine sound up and raises its pitch together, like a real engine revving
+            self.currentFrame = _resample_block(self.audioTimeSeries, outdata[:, 0], self.currentFrame, self.pitchFactor)
         else:
             outdata.fill(0)
 
 
     def on_press(self, key):
-        global isWPressed, isEscPressed
-
         try:
             if key.char.upper() == 'W':
-                isWPressed = True
+                self.isWPressed = True
                 print(" key pressed, revving engine up")
         except AttributeError:
             # Special key
@@ -141,11 +242,9 @@ class EngineSoundPitchShifter:
 
 
     def on_release(self, key):
-        global isWPressed, isEscPressed
-
         try:
             if key.char.upper() == 'W':
-                isWPressed = False
+                self.isWPressed = False
                 print(" key released, engine revving down")
 
         except AttributeError:
@@ -154,19 +253,16 @@ class EngineSoundPitchShifter:
 
 
     def simulate_gas_pedal(self):
-        global isWPressed, isEscPressed
-
-        while self.running:
+        # Waiting on stopEvent is the small 10 ms delay that prevents excessive CPU usage,
+        # and it returns immediately once cleanup() is called from another thread
+        while not self.stopEvent.wait(0.01):
             # Simulate gas pedal with W key
             if self.isWPressed:
                 # Gradually increase pitch while W is held
                 self.pitchFactor = min(2.0, self.pitchFactor + 0.02)
             else:
                 # Gradually return to normal pitch when W is released
-                if self.pitchFactor > 1.0:
-                    self.pitchFactor = max(1.0, self.pitchFactor - 0.02)
-
-            sleep(0.01)  # Small 10 ms delay to prevent excessive CPU usage
+                self.pitchFactor = max(1.0, self.pitchFactor - 0.02)
 
 
     def unit_test(self):
@@ -175,7 +271,7 @@ class EngineSoundPitchShifter:
         listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
         listener.start()
 
-        while(True):
+        while not self.stopEvent.is_set():
             self.simulate_gas_pedal()
 
 
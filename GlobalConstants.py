@@ -12,6 +12,7 @@ __doc__        = "Useful global constants for the entire EV Customs DMuffler lib
 ## Standard Python libraries
 import os                           # TODO
 from dataclasses import dataclass   # TODO
+from functools import lru_cache     # Memoize asset validation between filesystem changes
 from typing import List             # TODO
 
 # Global print() statement toggle for entire DMuffler library
@@ -43,9 +44,10 @@ SUPPORTED_VEHICLES: List[SupportedVehicle] = [
         SupportedVehicle(VINFAST, "VF 8", 2023)
 ]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VehicleAsset:
     """ Defines canonical image and sound asset paths of all digital vehicles in DMuffler.
+        Slotted so each asset is a compact four field record without a per-instance __dict__
     """
     engineSoundID: str  # Unique Sound ID to let embedded software communicate with mobile app
     name: str           # Car name for User Interfaces (UI's)
@@ -62,18 +64,28 @@ JAGUAR_E_TYPE_SERIES_1 = "4"
 FORD_MODEL_T = "5"
 FORD_MUSTANG_GT350 = "6"
 
+# Asset folders relative to the DMuffler root, with filenames appended by plain string concatenation
+IMAGE_ROOT = f"static{os.sep}images{os.sep}"
+SOUND_ROOT = f"static{os.sep}sounds{os.sep}"
+
 VEHICLE_ASSETS: List[VehicleAsset] = [
-    VehicleAsset(MC_LAREN_F1, "McLaren F1", "static/images/McLarenF1.png", "static/sounds/McLarenF1.wav"),
-    VehicleAsset(LA_FERRARI, "Ferrari LaFerrari", "static/images/LaFerrari.png", "static/sounds/LaFerrari.wav"),
-    VehicleAsset(PORCSHE_911, "Porsche 911", "static/images/Porsche911.png", "static/sounds/Porsche911.wav"),
-    VehicleAsset(BMW_M4, "BMW M4", "static/images/BMW_M4.png", "static/sounds/BMW_M4.wav"),
-    VehicleAsset(JAGUAR_E_TYPE_SERIES_1, "Jaguar E-Type", "static/images/JaguarEtypeSeries1.png", "static/sounds/JaguarEtypeSeries1.wav"),
-    VehicleAsset(FORD_MODEL_T, "Ford Model T", "static/images/FordModelT.png", "static/sounds/FordModelT.wav"),
-    VehicleAsset(FORD_MUSTANG_GT350, "Ford Mustang GT350", "static/images/FordMustangGT350.png", "static/sounds/FordMustangGT350.wav"),
+    VehicleAsset(MC_LAREN_F1, "McLaren F1", IMAGE_ROOT + "McLarenF1.png", SOUND_ROOT + "McLarenF1.wav"),
+    VehicleAsset(LA_FERRARI, "Ferrari LaFerrari", IMAGE_ROOT + "LaFerrari.png", SOUND_ROOT + "LaFerrari.wav"),
+    VehicleAsset(PORCSHE_911, "Porsche 911", IMAGE_ROOT + "Porsche911.png", SOUND_ROOT + "Porsche911.wav"),
+    VehicleAsset(BMW_M4, "BMW M4", IMAGE_ROOT + "BMW_M4.png", SOUND_ROOT + "BMW_M4.wav"),
+    VehicleAsset(JAGUAR_E_TYPE_SERIES_1, "Jaguar E-Type", IMAGE_ROOT + "JaguarEtypeSeries1.png", SOUND_ROOT + "JaguarEtypeSeries1.wav"),
+    VehicleAsset(FORD_MODEL_T, "Ford Model T", IMAGE_ROOT + "FordModelT.png", SOUND_ROOT + "FordModelT.wav"),
+    VehicleAsset(FORD_MUSTANG_GT350, "Ford Mustang GT350", IMAGE_ROOT + "FordMustangGT350.png", SOUND_ROOT + "FordMustangGT350.wav"),
     # TODO VehicleAsset("star_wars_podracer", "static/images/STAR_WARS_PODRACER.png", "static/sounds/STAR_WARS_PODRACER.mp3"),
     # TODO VehicleAsset("subaru_wrx_sti", "static/images/SUBARU_WRX_STI.png", "static/sounds/SUBARU_WRX_STI.mp3"),
 ]
 
+# Image paths, sound paths, names and directories of every VEHICLE_ASSETS entry
+IMAGE_PATHS = tuple(asset.image for asset in VEHICLE_ASSETS)
+SOUND_PATHS = tuple(asset.sound for asset in VEHICLE_ASSETS)
+ASSET_NAMES = frozenset(asset.name for asset in VEHICLE_ASSETS)
+ASSET_DIRECTORIES = tuple(sorted({os.path.dirname(path) for path in IMAGE_PATHS + SOUND_PATHS}))
+
 # Physical hardware CONTSTANTS
 GO_PEDAL = 0                    # Pedal furthest right in the UK and USA
 GO_PEDAL_POSITION_CAN_BUS_IDENTIFIER = [0b11_111_111_111]           #TODO or 29bit?
@@ -85,6 +97,10 @@ BRAKE_PEDAL_POSITION_CAN_BUS_IDENTIFIER = [0b11_111_111_111]        #TODO or 29b
 TOP_GEAR = 5
 MAX_RPM = 10_000
 
+# Audio playback CONSTANTS
+AUDIO_BLOCK_SIZE = 2048         # Units are frames per sounddevice callback (~46 ms at 44.1 kHz)
+AUDIO_DECODE_BLOCK_SIZE = 65536 # Units are frames read per block while decoding a multi-channel audio file
+
 # Tesla CAN Bus CONSTANTS
 VELOCITY_SENSOR_CAN_BUS_IDENTIFIER = [0b111_1111_1111]             #TODO or 29bit?
 ENGINE_LOAD_CAN_BUS_IDENTIFIER = [0b111_1111_1111]                 #TODO or 29bit?
@@ -149,20 +165,46 @@ SAE_J1850_PWM = 1
 SAE_J1850_VPW = 2
 
 # Utility: Validate asset existence at startup
+@lru_cache(maxsize=1)
+def _find_missing_assets(directorySnapshot: tuple) -> tuple:
+    """ Find asset files missing from disk, cached until an asset directory changes
+
+    Arg(s):
+        directorySnapshot (tuple): (absolute path, st_mtime_ns or None) of each ASSET_DIRECTORIES entry, used as cache key
+
+    Returns:
+        tuple: Relative paths of missing image and sound assets
+    """
+    # Read each asset directory once, instead of a stat() per file
+    filesInDirectory = {}
+    for directory, (absoluteDirectory, mtime) in zip(ASSET_DIRECTORIES, directorySnapshot):
+        if mtime is None:
+            filesInDirectory[directory] = set()
+            continue
+        with os.scandir(absoluteDirectory) as entries:
+            filesInDirectory[directory] = {entry.name for entry in entries if entry.is_file()}
+
+    return tuple(path for path in IMAGE_PATHS + SOUND_PATHS if os.path.basename(path) not in filesInDirectory[os.path.dirname(path)])
+
+
 def validate_assets():
     """ Validate that sound and images file assets exist
+        Only one stat() per asset directory is needed until a file is added to or removed from it
 
     Arg(s):
         None
 
     Returns: Nothing
     """
-    missing = []
-    for asset in VEHICLE_ASSETS:
-        if not os.path.isfile(asset.image):
-            missing.append(asset.image)
-        if not os.path.isfile(asset.sound):
-            missing.append(asset.sound)
+    directorySnapshot = []
+    for directory in ASSET_DIRECTORIES:
+        absoluteDirectory = os.path.abspath(directory or ".")
+        try:
+            directorySnapshot.append((absoluteDirectory, os.stat(absoluteDirectory).st_mtime_ns))
+        except FileNotFoundError:
+            directorySnapshot.append((absoluteDirectory, None))
+
+    missing = list(_find_missing_assets(tuple(directorySnapshot)))
     if missing:
         raise FileNotFoundError(f"Missing asset files: {missing}")
 
@@ -34,16 +34,19 @@ from pyvin import VIN
 ## Internal libraries
 #TODO from EngineSoundGenerator import *
 ## Internal libraries
+import GlobalConstants as GC
 from Database import Database
 from EngineSoundPitchShifter import EngineSoundPitchShifter as ESPS
 #TODO Fix broken wheel from BluetoothConnector import ScanDelegate
 
-def integration_test():
+def integration_test(db: Database):
     """
     https://en.wikipedia.org/wiki/Integration_testing
 
+    Args:
+        db (Database): Unused, accepted so run() can pass its development database
     """
-    esps = ESPS(ESPS.MC_LAREN_F1)
+    esps = ESPS(GC.MC_LAREN_F1)
     esps.unit_test()
 
     #bleConnection = ScanDelegate()
@@ -53,7 +56,9 @@ def main(db: Database):
     pass
 
 
-if __name__ == "__main__":
+def run():
+    """ Parse the --mode command line argument, then boot DMuffler in DEV, TESTING, or PRODUCTION mode
+    """
     parser = argparse.ArgumentParser(description="Run DMuffler application in DEV, TESTING, or PRODUCTION mode?")
     parser.add_argument('--mode', nargs='+',choices=['DEV', 'TESTING', 'PRODUCTION'],
                         help='Configure state of GC.DEBUG_STATEMENTS_ON and whether integration_test() or main() is called.')
@@ -84,3 +89,7 @@ if __name__ == "__main__":
     elif 'PRODUCTION' in args.mode:
         peek("DMuffler booting in standard PRODUCTION mode", color="green")
         main(db)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,55 @@
+import sys
+import types
+
+
+class DefaultDelegate:
+    def __init__(self):
+        pass
+
+
+class Peripheral:
+    def __init__(self, deviceAddr=None, addrType=None):
+        self.addr = deviceAddr
+        self.addrType = addrType
+
+    def getServices(self):
+        return []
+
+    def disconnect(self):
+        pass
+
+
+class ScanEntry:
+    def __init__(self, addr="", addrType="public", rssi=0):
+        self.addr = addr
+        self.addrType = addrType
+        self.rssi = rssi
+
+    def getScanData(self):
+        return []
+
+    def getValueText(self, adtype):
+        return ""
+
+
+class Scanner:
+    def withDelegate(self, delegate):
+        return self
+
+    def scan(self, timeout=10.0):
+        return []
+
+
+# BluetoothConnector imports bluepy.btle and scans at import time, which happens while pytest collects
+# test_bluetooth_connector.py, so the stand-in modules must be in sys.modules before any fixture could run
+btle = types.ModuleType("bluepy.btle")
+btle.DefaultDelegate = DefaultDelegate
+btle.Peripheral = Peripheral
+btle.ScanEntry = ScanEntry
+btle.Scanner = Scanner
+
+bluepy = types.ModuleType("bluepy")
+bluepy.btle = btle
+
+sys.modules["bluepy"] = bluepy
+sys.modules["bluepy.btle"] = btle
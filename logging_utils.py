@@ -7,18 +7,25 @@ Provides log_info, log_warning, log_error, and logger configuration.
 import logging
 
 logger = logging.getLogger("dmuffler")
-handler = logging.StreamHandler()
-formatter = logging.Formatter("[%(levelname)s] %(asctime)s %(message)s")
-handler.setFormatter(formatter)
-if not logger.hasHandlers():
-    logger.addHandler(handler)
-logger.setLevel(logging.INFO)
 
-def log_info(msg):
-    logger.info(msg)
+# Configure the shared logger only once, even if this module is imported under
+# two names or reloaded, so every message is written to stdout a single time
+if not getattr(logger, "_dmuffler_configured", False):
+    if not logger.hasHandlers():
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter("[%(levelname)s] %(asctime)s %(message)s")
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger._dmuffler_configured = True
 
-def log_warning(msg):
-    logger.warning(msg)
+# Extra args are passed through for %-style formatting, which logging defers
+# until a handler actually emits the record
+def log_info(msg, *args):
+    logger.info(msg, *args)
 
-def log_error(msg):
-    logger.error(msg)
+def log_warning(msg, *args):
+    logger.warning(msg, *args)
+
+def log_error(msg, *args):
+    logger.error(msg, *args)
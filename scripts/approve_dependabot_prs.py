@@ -6,43 +6,157 @@ This script automatically approves and merges Dependabot pull requests
 that pass all required checks. It's designed to be run as a GitHub Action.
 """
 
+import json
 import os
 import re
-from typing import List
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from github import Github, GithubException
 
-# Initialize GitHub client
-github = Github(os.getenv("GITHUB_TOKEN"))
+# Initialize GitHub client, listing 100 items per page instead of the default 30
+github = Github(os.getenv("GITHUB_TOKEN"), per_page=100)
 repo = github.get_repo(os.getenv("GITHUB_REPOSITORY"))
 
+# Dependabot PR title, e.g. "Bump requests from 2.32.2 to 2.32.3"
+BUMP_TITLE_RE = re.compile(r"^Bump (.+?) from ([\d.]+) to ([\d.]+)")
 
-def get_dependabot_prs():
-    """Get all open Dependabot PRs in the repository."""
-    return [pr for pr in repo.get_pulls(state="open") if pr.user.login == "dependabot[bot]"]
+# PR number -> head SHA approved on an earlier run, so reruns skip get_reviews for unchanged PRs
+APPROVAL_CACHE_PATH = Path(os.getenv("DEPENDABOT_CACHE", ".dependabot_cache.json"))
 
 
-def pr_has_passing_checks(pr) -> bool:
-    """Check if all required checks have passed for a PR."""
-    # Get the commit status
-    commit = repo.get_commit(pr.head.sha)
-    status = commit.get_combined_status()
+def get_updated_cutoff() -> Optional[datetime]:
+    """Get the oldest PR update time worth scanning, from DEPENDABOT_UPDATED_WITHIN_HOURS."""
+    hours = os.getenv("DEPENDABOT_UPDATED_WITHIN_HOURS")
+    if not hours:
+        return None
+    return datetime.now(timezone.utc) - timedelta(hours=float(hours))
+
+
+def get_dependabot_prs(updated_since: Optional[datetime] = None):
+    """Get all open Dependabot PRs in the repository.
+
+    PRs are listed most recently updated first, so with updated_since set the
+    listing stops at the first older PR instead of fetching the remaining pages.
+    """
+    prs = []
+    for pr in repo.get_pulls(state="open", sort="updated", direction="desc"):
+        if updated_since is not None and pr.updated_at < updated_since:
+            break
+        if pr.user.login == "dependabot[bot]":
+            prs.append(pr)
+    return prs
+
+
+# Combined status and latest check runs of a commit, selected once per commit under an alias
+COMMIT_CHECKS_FRAGMENT = """
+fragment CommitChecks on Commit {
+  status { state }
+  checkSuites(first: 20) {
+    pageInfo { hasNextPage }
+    nodes {
+      checkRuns(first: 50, filterBy: {checkType: LATEST}) {
+        pageInfo { hasNextPage }
+        nodes { name conclusion }
+      }
+    }
+  }
+}
+"""
+
+CommitChecks = Tuple[Optional[str], List[Dict[str, str]]]
+
+
+def get_commit_checks(shas: List[str]) -> Dict[str, CommitChecks]:
+    """Get the combined status state and latest check runs of every commit in a single request.
+
+    Only a commit whose check suites or check runs overflow one GraphQL page
+    costs an extra, paginated REST listing.
+    """
+    owner, name = os.getenv("GITHUB_REPOSITORY").split("/")
+    variables = {"owner": owner, "name": name}
+    parameters = ["$owner: String!", "$name: String!"]
+    selections = []
+    for i, sha in enumerate(shas):
+        variables[f"oid{i}"] = sha
+        parameters.append(f"$oid{i}: GitObjectID!")
+        selections.append(f"c{i}: object(oid: $oid{i}) {{ ...CommitChecks }}")
+
+    selection_lines = "\n    ".join(selections)
+    query = (
+        f"query({', '.join(parameters)}) {{\n"
+        f"  repository(owner: $owner, name: $name) {{\n    {selection_lines}\n  }}\n"
+        f"}}\n{COMMIT_CHECKS_FRAGMENT}"
+    )
+    _, data = repo._requester.graphql_query(query, variables)
+
+    repository = data["data"]["repository"]
+    commit_checks = {}
+    for i, sha in enumerate(shas):
+        commit = repository[f"c{i}"] or {}
+        # A commit without any statuses has no status object, which REST reports as "pending"
+        state = (commit.get("status") or {}).get("state")
+        suites = commit.get("checkSuites") or {}
+        if has_next_page(suites) or any(
+            has_next_page(suite["checkRuns"]) for suite in suites.get("nodes", [])
+        ):
+            print(f"Check runs of {sha} exceed one GraphQL page, listing them over REST")
+            check_runs = get_rest_check_runs(sha)
+        else:
+            check_runs = [
+                run for suite in suites.get("nodes", []) for run in suite["checkRuns"]["nodes"]
+            ]
+        commit_checks[sha] = (state, check_runs)
+    return commit_checks
+
+
+def has_next_page(connection: Dict) -> bool:
+    """Whether a GraphQL connection was cut off at its page size."""
+    return bool((connection.get("pageInfo") or {}).get("hasNextPage"))
+
+
+def get_rest_check_runs(sha: str) -> List[Dict[str, str]]:
+    """List the latest run of every check on a commit, following REST pagination."""
+    return [
+        # REST conclusions are lowercase, GraphQL's CheckConclusionState is uppercase
+        {"name": run.name, "conclusion": run.conclusion.upper() if run.conclusion else None}
+        for run in repo.get_commit(sha).get_check_runs(filter="latest")
+    ]
+
+
+def pr_has_passing_checks(
+    pr,
+    commit_checks: Optional[CommitChecks] = None,
+    required_checks: Optional[List[str]] = None,
+) -> bool:
+    """Check if all required checks have passed for a PR.
+
+    commit_checks can be passed in from a get_commit_checks() call that covered
+    several PRs at once; otherwise it is fetched for this PR's head commit.
+    required_checks defaults to get_required_checks().
+    """
+    if commit_checks is None:
+        commit_checks = get_commit_checks([pr.head.sha])[pr.head.sha]
+    state, check_runs = commit_checks
 
     # Check if all statuses are success
-    if status.state != "success":
+    if state != "SUCCESS":
         return False
 
     # Check required checks if any
-    required_checks = get_required_checks()
+    if required_checks is None:
+        required_checks = get_required_checks()
     if required_checks:
-        check_runs = commit.get_check_runs()
-        for check in required_checks:
-            if not any(run.name == check and run.conclusion == "success" for run in check_runs):
-                return False
+        passing_checks = {run["name"] for run in check_runs if run["conclusion"] == "SUCCESS"}
+        if not passing_checks.issuperset(required_checks):
+            return False
 
     return True
 
 
+@lru_cache(maxsize=1)
 def get_required_checks() -> List[str]:
     """Get the list of required checks that must pass before merging."""
     # This can be customized based on your repository's requirements
@@ -65,6 +179,26 @@ def approve_pr(pr) -> bool:
         return False
 
 
+def load_approval_cache() -> Dict[str, str]:
+    """Load the PR number -> approved head SHA cache, empty if missing or unreadable."""
+    try:
+        with APPROVAL_CACHE_PATH.open() as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_approval_cache(cache: Dict[str, str]) -> None:
+    """Write the approval cache, replacing the old file only once the new one is complete."""
+    tmp_path = APPROVAL_CACHE_PATH.with_name(APPROVAL_CACHE_PATH.name + ".tmp")
+    try:
+        with tmp_path.open("w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, APPROVAL_CACHE_PATH)
+    except OSError as e:
+        print(f"Error saving approval cache: {e}")
+
+
 def add_comment(pr, comment: str) -> None:
     """Add a comment to a pull request."""
     try:
@@ -82,7 +216,7 @@ def merge_pr(pr) -> bool:
 
         # Format commit message
         title = pr.title
-        if match := re.match(r"^Bump (.+?) from ([\d.]+) to ([\d.]+)", title):
+        if match := BUMP_TITLE_RE.match(title):
             pkg, old_ver, new_ver = match.groups()
             title = f"chore(deps): Bump {pkg} from {old_ver} to {new_ver}"
 
@@ -97,17 +231,36 @@ def main() -> None:
     """Main function to process Dependabot PRs."""
     print("Checking for Dependabot PRs...")
 
-    for pr in get_dependabot_prs():
+    prs = get_dependabot_prs(get_updated_cutoff())
+    required_checks = get_required_checks()
+
+    # Look up the checks of every PR in one round trip rather than one per PR
+    commit_checks = get_commit_checks([pr.head.sha for pr in prs]) if prs else {}
+    # Keep only PRs still listed, so closed and merged PRs drop out on the next save
+    open_prs = {str(pr.number) for pr in prs}
+    approval_cache = {
+        number: sha
+        for number, sha in load_approval_cache().items()
+        if number in open_prs
+    }
+
+    for pr in prs:
         print(f"Processing PR #{pr.number}: {pr.title}")
 
-        if not pr_has_passing_checks(pr):
+        if not pr_has_passing_checks(pr, commit_checks[pr.head.sha], required_checks):
             print(f"PR #{pr.number} does not have passing checks, skipping")
             continue
 
-        print(f"Approving PR #{pr.number}")
-        if not approve_pr(pr):
-            print(f"Failed to approve PR #{pr.number}")
-            continue
+        # An approval of this exact head commit was recorded on an earlier run
+        if approval_cache.get(str(pr.number)) == pr.head.sha:
+            print(f"PR #{pr.number} already approved at {pr.head.sha}")
+        else:
+            print(f"Approving PR #{pr.number}")
+            if not approve_pr(pr):
+                print(f"Failed to approve PR #{pr.number}")
+                continue
+            approval_cache[str(pr.number)] = pr.head.sha
+            save_approval_cache(approval_cache)
 
         print(f"Merging PR #{pr.number}")
         if not merge_pr(pr):
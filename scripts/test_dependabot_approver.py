@@ -7,9 +7,15 @@ This module contains tests for the Dependabot PR approval and merging logic.
 
 import os
 import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
+from github import Github
+from github.PullRequest import PullRequest
+from github.Repository import Repository
+from github.Requester import Requester
 
 # Add scripts directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,29 +33,71 @@ with patch("github.Github"):
         add_comment,
         merge_pr,
         get_required_checks,
+        get_updated_cutoff,
+        load_approval_cache,
         main,
     )
 
 
+def commit_checks_node(state, check_runs=(), truncated=False):
+    """Build the CommitChecks fragment GitHub returns for one commit."""
+    return {
+        "status": {"state": state} if state else None,
+        "checkSuites": {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [
+                {
+                    "checkRuns": {
+                        "pageInfo": {"hasNextPage": truncated},
+                        "nodes": [
+                            {"name": name, "conclusion": conclusion}
+                            for name, conclusion in check_runs
+                        ],
+                    }
+                }
+            ],
+        },
+    }
+
+
+def graphql_checks_response(*commit_nodes):
+    """Build the (headers, data) pair Requester.graphql_query returns for get_commit_checks."""
+    return {}, {
+        "data": {"repository": {f"c{i}": node for i, node in enumerate(commit_nodes)}}
+    }
+
+
+@dataclass
+class SharedMocks:
+    """GitHub client and repository mocks shared by every test in this module."""
+
+    github: MagicMock
+    repo: MagicMock
+
+
+@pytest.fixture(scope="module")
+def shared_mocks():
+    """Build the specced GitHub client and repository mocks once per module."""
+    mock_repo = MagicMock(spec=Repository)
+    mock_repo._requester = MagicMock(spec=Requester)
+    mock_github = MagicMock(spec=Github)
+    mock_github.get_repo.return_value = mock_repo
+    return SharedMocks(github=mock_github, repo=mock_repo)
+
+
 @pytest.fixture(autouse=True)
-def setup_mocks():
-    """Set up all necessary mocks for testing."""
-    with patch("github.Github") as mock_github, patch(
-        "scripts.approve_dependabot_prs.github"
-    ) as mock_module_github, patch("scripts.approve_dependabot_prs.repo") as mock_module_repo:
-
-        # Set up mock GitHub instance
-        mock_repo = MagicMock()
-        mock_github.return_value.get_repo.return_value = mock_repo
-        mock_module_github.get_repo.return_value = mock_repo
-        mock_module_repo = mock_repo
-
-        yield {
-            "github": mock_github,
-            "repo": mock_repo,
-            "module_github": mock_module_github,
-            "module_repo": mock_module_repo,
-        }
+def setup_mocks(shared_mocks, monkeypatch, tmp_path):
+    """Point the module at the shared mocks, cleared of state left by the previous test."""
+    shared_mocks.repo.reset_mock(return_value=True, side_effect=True)
+    shared_mocks.github.reset_mock(return_value=True, side_effect=True)
+    shared_mocks.github.get_repo.return_value = shared_mocks.repo
+
+    monkeypatch.setattr("scripts.approve_dependabot_prs.github", shared_mocks.github)
+    monkeypatch.setattr("scripts.approve_dependabot_prs.repo", shared_mocks.repo)
+    monkeypatch.setattr(
+        "scripts.approve_dependabot_prs.APPROVAL_CACHE_PATH", tmp_path / "approval_cache.json"
+    )
+    return shared_mocks
 
 
 class TestDependabotApprover:
@@ -58,8 +106,8 @@ class TestDependabotApprover:
     def test_get_dependabot_prs(self, setup_mocks):
         """Test finding Dependabot PRs."""
         # Setup
-        mock_repo = setup_mocks["repo"]
-        mock_pr = MagicMock()
+        mock_repo = setup_mocks.repo
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.user.login = "dependabot[bot]"
         mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
         mock_pr.number = 1
@@ -70,64 +118,171 @@ class TestDependabotApprover:
         mock_repo.get_pulls.return_value = mock_pulls
 
         # Test
-        with patch("scripts.approve_dependabot_prs.repo", mock_repo):
-            prs = list(get_dependabot_prs())
-            assert len(prs) == 1
-            assert prs[0].number == 1
-            mock_repo.get_pulls.assert_called_once_with(state="open")
+        prs = list(get_dependabot_prs())
+        assert len(prs) == 1
+        assert prs[0].number == 1
+        mock_repo.get_pulls.assert_called_once_with(
+            state="open", sort="updated", direction="desc"
+        )
+
+    def test_get_dependabot_prs_stops_at_updated_cutoff(self, setup_mocks):
+        """Test that listing stops at the first PR updated before the cutoff."""
+        # Setup
+        mock_repo = setup_mocks.repo
+        cutoff = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+        def make_pr(number, login, updated_at):
+            mock_pr = MagicMock(spec=PullRequest)
+            mock_pr.number = number
+            mock_pr.user.login = login
+            mock_pr.updated_at = updated_at
+            return mock_pr
+
+        # Pages are already sorted by most recently updated first
+        first_page = [
+            make_pr(3, "dependabot[bot]", cutoff + timedelta(hours=2)),
+            make_pr(2, "octocat", cutoff + timedelta(hours=1)),
+        ]
+        second_page = [
+            make_pr(1, "dependabot[bot]", cutoff + timedelta(minutes=5)),
+            make_pr(0, "dependabot[bot]", cutoff - timedelta(days=30)),
+        ]
+        third_page = [make_pr(-1, "dependabot[bot]", cutoff - timedelta(days=60))]
+        fetched_pages = []
+
+        def paginated_pulls():
+            for page in (first_page, second_page, third_page):
+                fetched_pages.append(page)
+                yield from page
+
+        mock_repo.get_pulls.return_value = paginated_pulls()
+
+        # Test
+        prs = get_dependabot_prs(updated_since=cutoff)
+        assert [pr.number for pr in prs] == [3, 1]
+        assert fetched_pages == [first_page, second_page]
+
+    def test_get_updated_cutoff(self, monkeypatch):
+        """Test reading the updated-within window from the environment."""
+        monkeypatch.delenv("DEPENDABOT_UPDATED_WITHIN_HOURS", raising=False)
+        assert get_updated_cutoff() is None
+
+        monkeypatch.setenv("DEPENDABOT_UPDATED_WITHIN_HOURS", "6")
+        cutoff = get_updated_cutoff()
+        expected = datetime.now(timezone.utc) - timedelta(hours=6)
+        assert abs(cutoff - expected) < timedelta(seconds=5)
 
     def test_pr_has_passing_checks(self, setup_mocks):
         """Test if PR has passing checks."""
         # Setup
-        mock_repo = setup_mocks["repo"]
-        mock_pr = MagicMock()
+        mock_repo = setup_mocks.repo
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.head.sha = "test_sha"
-
-        # Mock the commit and status
-        mock_commit = MagicMock()
-        mock_status = MagicMock()
+        graphql_query = mock_repo._requester.graphql_query
 
         # Test with passing checks
-        mock_status.state = "success"
-        mock_commit.get_combined_status.return_value = mock_status
-        mock_repo.get_commit.return_value = mock_commit
+        graphql_query.return_value = graphql_checks_response(commit_checks_node("SUCCESS"))
 
         # Mock the repository in the module
-        with patch("scripts.approve_dependabot_prs.repo", mock_repo):
-            with patch("scripts.approve_dependabot_prs.get_required_checks", return_value=[]):
-                # Mock the PR's repository
-                mock_pr.base.repo = mock_repo
-                assert pr_has_passing_checks(mock_pr) is True
-
-            # Test with failing status
-            mock_status.state = "failure"
-            with patch("scripts.approve_dependabot_prs.get_required_checks", return_value=[]):
-                assert pr_has_passing_checks(mock_pr) is False
-
-            # Test with required checks
-            with patch(
-                "scripts.approve_dependabot_prs.get_required_checks", return_value=["test-check"]
-            ):
-                mock_check_run = MagicMock()
-                mock_check_run.name = "test-check"
-                mock_check_run.conclusion = "success"
-                mock_commit.get_check_runs.return_value = [mock_check_run]
-
-                # Status is still failing
-                assert pr_has_passing_checks(mock_pr) is False
-
-                # Now with passing status
-                mock_status.state = "success"
-                assert pr_has_passing_checks(mock_pr) is True
-
-                # Failing check run
-                mock_check_run.conclusion = "failure"
-                assert pr_has_passing_checks(mock_pr) is False
+        # Mock the PR's repository
+        mock_pr.base.repo = mock_repo
+        assert pr_has_passing_checks(mock_pr, required_checks=[]) is True
+
+        # Status and check runs come from one GraphQL request for the head commit
+        graphql_query.assert_called_once()
+        assert graphql_query.call_args[0][1] == {
+            "owner": "test-owner",
+            "name": "test-repo",
+            "oid0": "test_sha",
+        }
+        mock_repo.get_commit.assert_not_called()
+
+        # Test with failing status
+        graphql_query.return_value = graphql_checks_response(commit_checks_node("FAILURE"))
+        assert pr_has_passing_checks(mock_pr, required_checks=[]) is False
+
+        # Test with no statuses reported yet
+        graphql_query.return_value = graphql_checks_response(commit_checks_node(None))
+        assert pr_has_passing_checks(mock_pr, required_checks=[]) is False
+
+        # Test with required checks
+        required_checks = ["test-check"]
+
+        # Status is still failing
+        graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("FAILURE", [("test-check", "SUCCESS")])
+        )
+        assert pr_has_passing_checks(mock_pr, required_checks=required_checks) is False
+
+        # Now with passing status
+        graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test-check", "SUCCESS")])
+        )
+        assert pr_has_passing_checks(mock_pr, required_checks=required_checks) is True
+
+        # Failing check run
+        graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test-check", "FAILURE")])
+        )
+        assert pr_has_passing_checks(mock_pr, required_checks=required_checks) is False
+
+        # A passing run of another check does not satisfy a required one
+        graphql_query.return_value = graphql_checks_response(
+            commit_checks_node(
+                "SUCCESS", [("other-check", "SUCCESS"), ("test-check", "FAILURE")]
+            )
+        )
+        assert pr_has_passing_checks(mock_pr, required_checks=required_checks) is False
+
+        # Without an explicit list the defaults from get_required_checks() apply
+        graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test", "SUCCESS")])
+        )
+        assert pr_has_passing_checks(mock_pr) is False
+
+    def test_pr_has_passing_checks_lists_truncated_check_runs_over_rest(
+        self, setup_mocks, capsys
+    ):
+        """Test that check runs cut off by the GraphQL page size are listed over REST."""
+        mock_repo = setup_mocks.repo
+        mock_pr = MagicMock(spec=PullRequest)
+        mock_pr.head.sha = "test_sha"
+
+        # The required check is past the first page of check runs
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("lint", "SUCCESS")], truncated=True)
+        )
+        lint, test = MagicMock(conclusion="success"), MagicMock(conclusion="success")
+        lint.name, test.name = "lint", "test"
+        mock_repo.get_commit.return_value.get_check_runs.return_value = [lint, test]
+
+        assert pr_has_passing_checks(mock_pr, required_checks=["lint", "test"]) is True
+
+        mock_repo.get_commit.assert_called_once_with("test_sha")
+        mock_repo.get_commit.return_value.get_check_runs.assert_called_once_with(
+            filter="latest"
+        )
+        assert "Check runs of test_sha exceed one GraphQL page" in capsys.readouterr().out
+
+    def test_commit_checks_query_requests_latest_runs_only(self, setup_mocks):
+        """Test that superseded check runs are filtered out by the query itself."""
+        mock_repo = setup_mocks.repo
+        mock_pr = MagicMock(spec=PullRequest)
+        mock_pr.head.sha = "test_sha"
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS")
+        )
+
+        pr_has_passing_checks(mock_pr, required_checks=[])
+
+        query = mock_repo._requester.graphql_query.call_args[0][0]
+        assert "filterBy: {checkType: LATEST}" in query
+        assert query.count("pageInfo { hasNextPage }") == 2
 
     def test_approve_pr(self):
         """Test approving a PR."""
         # Setup
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.get_reviews.return_value = []
 
         # Test approving a PR that needs approval
@@ -155,7 +310,7 @@ class TestDependabotApprover:
     def test_merge_pr(self, setup_mocks):
         """Test merging a PR."""
         # Setup
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.mergeable = True
         mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
 
@@ -184,7 +339,7 @@ class TestDependabotApprover:
 
     def test_add_comment(self):
         """Test adding a comment to a PR."""
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         test_comment = "Test comment"
 
         # Test successful comment
@@ -203,16 +358,22 @@ class TestDependabotApprover:
         # Test the default required checks
         assert get_required_checks() == ["test", "lint"]
 
-    def test_main(self, setup_mocks, capsys):
+        # Repeated lookups are served from the cache
+        hits = get_required_checks.cache_info().hits
+        assert get_required_checks() == ["test", "lint"]
+        assert get_required_checks.cache_info().hits == hits + 1
+
+    def test_main(self, setup_mocks, capsys, tmp_path):
         """Test the main function."""
         # Setup mocks
-        mock_repo = setup_mocks["repo"]
+        mock_repo = setup_mocks.repo
 
         # Create a mock PR
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.user.login = "dependabot[bot]"
         mock_pr.number = 1
         mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
+        mock_pr.head.sha = "sha1"
         mock_pr.mergeable = True
 
         # Mock the pull requests
@@ -220,21 +381,16 @@ class TestDependabotApprover:
         mock_pulls.__iter__.return_value = [mock_pr]
         mock_repo.get_pulls.return_value = mock_pulls
 
-        # Mock the commit status
-        mock_commit = MagicMock()
-        mock_status = MagicMock()
-        mock_status.state = "success"
-        mock_commit.get_combined_status.return_value = mock_status
-        mock_repo.get_commit.return_value = mock_commit
+        # Mock the commit status and check runs
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test", "SUCCESS")])
+        )
 
-        # Mock the check runs
-        mock_check_run = MagicMock()
-        mock_check_run.name = "test"
-        mock_check_run.conclusion = "success"
-        mock_commit.get_check_runs.return_value = [mock_check_run]
+        # Seed the cache with a PR that has since been closed
+        (tmp_path / "approval_cache.json").write_text('{"99": "stale"}')
 
         # Run the main function
-        with patch("scripts.approve_dependabot_prs.repo", mock_repo), patch(
+        with patch(
             "scripts.approve_dependabot_prs.get_required_checks", return_value=["test"]
         ):
             # Mock the PR's repository
@@ -258,13 +414,127 @@ class TestDependabotApprover:
                 merge_method="squash",
             )
 
+            # Verify the approval was cached against the head commit, and the closed PR pruned
+            assert load_approval_cache() == {"1": "sha1"}
+
+    def test_main_skips_cached_approval(self, setup_mocks, capsys, tmp_path):
+        """Test that main skips the review lookup for a PR approved at the same head commit."""
+        # Setup mocks
+        mock_repo = setup_mocks.repo
+
+        # Create a mock PR
+        mock_pr = MagicMock(spec=PullRequest)
+        mock_pr.user.login = "dependabot[bot]"
+        mock_pr.number = 1
+        mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
+        mock_pr.head.sha = "sha1"
+        mock_pr.mergeable = True
+        mock_repo.get_pulls.return_value = [mock_pr]
+
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test", "SUCCESS")])
+        )
+
+        # Seed the cache as an earlier run would have left it
+        (tmp_path / "approval_cache.json").write_text('{"1": "sha1"}')
+
+        with patch(
+            "scripts.approve_dependabot_prs.get_required_checks", return_value=["test"]
+        ):
+            main()
+
+            captured = capsys.readouterr()
+            assert "PR #1 already approved at sha1" in captured.out
+            assert "Successfully merged PR #1" in captured.out
+
+            # Verify the approval round trips were skipped but the PR was still merged
+            mock_pr.get_reviews.assert_not_called()
+            mock_pr.create_review.assert_not_called()
+            mock_pr.merge.assert_called_once()
+
+    def test_main_looks_up_all_checks_in_one_request(self, setup_mocks, capsys):
+        """Test that main fetches the checks of every PR with a single GraphQL query."""
+        # Setup mocks
+        mock_repo = setup_mocks.repo
+
+        # Create two mock PRs, only the first of which passes its checks
+        mock_prs = []
+        for number in (1, 2):
+            mock_pr = MagicMock(spec=PullRequest)
+            mock_pr.user.login = "dependabot[bot]"
+            mock_pr.number = number
+            mock_pr.title = f"Bump package-{number} from 1.0.0 to 1.0.1"
+            mock_pr.head.sha = f"sha{number}"
+            mock_pr.mergeable = True
+            mock_prs.append(mock_pr)
+        mock_repo.get_pulls.return_value = mock_prs
+
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test", "SUCCESS")]),
+            commit_checks_node("FAILURE", [("test", "SUCCESS")]),
+        )
+
+        with patch(
+            "scripts.approve_dependabot_prs.get_required_checks", return_value=["test"]
+        ):
+            main()
+
+            mock_repo._requester.graphql_query.assert_called_once()
+            variables = mock_repo._requester.graphql_query.call_args[0][1]
+            assert variables["oid0"] == "sha1"
+            assert variables["oid1"] == "sha2"
+
+            captured = capsys.readouterr()
+            assert "Successfully merged PR #1" in captured.out
+            assert "PR #2 does not have passing checks, skipping" in captured.out
+            mock_prs[1].merge.assert_not_called()
+
+    def test_main_lists_only_truncated_commits_over_rest(self, setup_mocks, capsys):
+        """Test that in the batched query only commits whose checks were cut off go to REST."""
+        mock_repo = setup_mocks.repo
+
+        mock_prs = []
+        for number in (1, 2):
+            mock_pr = MagicMock(spec=PullRequest)
+            mock_pr.user.login = "dependabot[bot]"
+            mock_pr.number = number
+            mock_pr.title = f"Bump package-{number} from 1.0.0 to 1.0.1"
+            mock_pr.head.sha = f"sha{number}"
+            mock_pr.mergeable = True
+            mock_prs.append(mock_pr)
+        mock_repo.get_pulls.return_value = mock_prs
+
+        # The second commit has more check suites than the query's first page
+        truncated_node = commit_checks_node("SUCCESS")
+        truncated_node["checkSuites"]["pageInfo"]["hasNextPage"] = True
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test", "SUCCESS")]),
+            truncated_node,
+        )
+        test_run = MagicMock(conclusion="success")
+        test_run.name = "test"
+        mock_repo.get_commit.return_value.get_check_runs.return_value = [test_run]
+
+        with patch(
+            "scripts.approve_dependabot_prs.get_required_checks", return_value=["test"]
+        ):
+            main()
+
+        mock_repo._requester.graphql_query.assert_called_once()
+        mock_repo.get_commit.assert_called_once_with("sha2")
+
+        captured = capsys.readouterr()
+        assert "Check runs of sha2 exceed one GraphQL page" in captured.out
+        assert "Successfully merged PR #1" in captured.out
+        assert "Successfully merged PR #2" in captured.out
+
     def test_main_with_failing_checks(self, setup_mocks, capsys):
         """Test the main function with failing checks."""
         # Setup mocks
-        mock_repo = setup_mocks["repo"]
+        mock_repo = setup_mocks.repo
 
         # Create a mock PR
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.user.login = "dependabot[bot]"
         mock_pr.number = 1
         mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
@@ -275,14 +545,12 @@ class TestDependabotApprover:
         mock_repo.get_pulls.return_value = mock_pulls
 
         # Mock the commit status to be failing
-        mock_commit = MagicMock()
-        mock_status = MagicMock()
-        mock_status.state = "failure"
-        mock_commit.get_combined_status.return_value = mock_status
-        mock_repo.get_commit.return_value = mock_commit
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("FAILURE")
+        )
 
         # Run the main function
-        with patch("scripts.approve_dependabot_prs.repo", mock_repo), patch(
+        with patch(
             "scripts.approve_dependabot_prs.get_required_checks", return_value=["test"]
         ):
             # Mock the PR's repository
@@ -302,13 +570,14 @@ class TestDependabotApprover:
     def test_main_with_merge_failure(self, setup_mocks, capsys):
         """Test the main function with a merge failure."""
         # Setup mocks
-        mock_repo = setup_mocks["repo"]
+        mock_repo = setup_mocks.repo
 
         # Create a mock PR
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.user.login = "dependabot[bot]"
         mock_pr.number = 1
         mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
+        mock_pr.head.sha = "sha1"
         mock_pr.mergeable = True  # PR is mergeable but will fail on merge
 
         # Mock the pull requests
@@ -316,24 +585,16 @@ class TestDependabotApprover:
         mock_pulls.__iter__.return_value = [mock_pr]
         mock_repo.get_pulls.return_value = mock_pulls
 
-        # Mock the commit status
-        mock_commit = MagicMock()
-        mock_status = MagicMock()
-        mock_status.state = "success"
-        mock_commit.get_combined_status.return_value = mock_status
-        mock_repo.get_commit.return_value = mock_commit
-
-        # Mock the check runs
-        mock_check_run = MagicMock()
-        mock_check_run.name = "test"
-        mock_check_run.conclusion = "success"
-        mock_commit.get_check_runs.return_value = [mock_check_run]
+        # Mock the commit status and check runs
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test", "SUCCESS")])
+        )
 
         # Mock the merge to raise an exception
         mock_pr.merge.side_effect = Exception("Merge conflict")
 
         # Run the main function
-        with patch("scripts.approve_dependabot_prs.repo", mock_repo), patch(
+        with patch(
             "scripts.approve_dependabot_prs.get_required_checks", return_value=["test"]
         ), patch("scripts.approve_dependabot_prs.pr_has_passing_checks", return_value=True):
             # Mock the PR's repository
@@ -353,7 +614,7 @@ class TestDependabotApprover:
     def test_approve_pr_error(self):
         """Test error handling in approve_pr function."""
         # Create a mock PR
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.get_reviews.return_value = []
 
         # Create a mock exception
@@ -371,7 +632,7 @@ class TestDependabotApprover:
     def test_merge_pr_error(self):
         """Test error handling in merge_pr function."""
         # Create a mock PR that's mergeable but will fail
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.mergeable = True
         mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
         mock_pr.merge.side_effect = Exception("Merge failed")
@@ -383,10 +644,10 @@ class TestDependabotApprover:
     def test_main_with_approval_failure(self, setup_mocks, capsys):
         """Test the main function when PR approval fails."""
         # Setup mocks
-        mock_repo = setup_mocks["repo"]
+        mock_repo = setup_mocks.repo
 
         # Create a mock PR
-        mock_pr = MagicMock()
+        mock_pr = MagicMock(spec=PullRequest)
         mock_pr.user.login = "dependabot[bot]"
         mock_pr.number = 1
         mock_pr.title = "Bump test-package from 1.0.0 to 1.0.1"
@@ -396,24 +657,16 @@ class TestDependabotApprover:
         mock_pulls.__iter__.return_value = [mock_pr]
         mock_repo.get_pulls.return_value = mock_pulls
 
-        # Mock the commit status
-        mock_commit = MagicMock()
-        mock_status = MagicMock()
-        mock_status.state = "success"
-        mock_commit.get_combined_status.return_value = mock_status
-        mock_repo.get_commit.return_value = mock_commit
-
-        # Mock the check runs
-        mock_check_run = MagicMock()
-        mock_check_run.name = "test"
-        mock_check_run.conclusion = "success"
-        mock_commit.get_check_runs.return_value = [mock_check_run]
+        # Mock the commit status and check runs
+        mock_repo._requester.graphql_query.return_value = graphql_checks_response(
+            commit_checks_node("SUCCESS", [("test", "SUCCESS")])
+        )
 
         # Mock the PR's repository
         mock_pr.base.repo = mock_repo
 
         # Run the main function with a failing approve_pr
-        with patch("scripts.approve_dependabot_prs.repo", mock_repo), patch(
+        with patch(
             "scripts.approve_dependabot_prs.get_required_checks", return_value=["test"]
         ), patch("scripts.approve_dependabot_prs.pr_has_passing_checks", return_value=True), patch(
             "scripts.approve_dependabot_prs.approve_pr", return_value=False
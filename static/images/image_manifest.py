@@ -6,33 +6,38 @@ Provides a validation utility to check manifest integrity and asset existence.
 """
 import os
 from dataclasses import dataclass
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping
 
 @dataclass(frozen=True)
 class ImageEntry:
     car_name: str
     filename: str
 
-# Canonical image manifest
-CAR_IMAGE_MAP: Dict[str, str] = {
-    "bmw_m4": "bmw_m4.png",
-    "ferrari_laferrari": "ferrari_laferrari.png",
-    "ford_model_t": "ford_model_t.png",
-    "ford_mustang": "ford_mustang.png",
+# Canonical image manifest, read-only so it can be shared without defensive copies
+CAR_IMAGE_MAP: Mapping[str, str] = MappingProxyType({
+    "bmw_m4": "BMW_M4.png",
+    "ferrari_laferrari": "FERRARI_LAFERRARI.png",
+    "ford_model_t": "FORD_MODEL_T.png",
+    "ford_mustang": "FORD_MUSTANG_GT350.png",
     "jaguar_e_type": "jaguar_e_type.png",
-    "mclaren_artura": "mclaren_artura.png",
-    "porsche_911": "porsche_911.png",
+    "mclaren_artura": "MCLAREN_ARTURA.png",
+    "porsche_911": "PORSCHE_911.png",
     "star_wars_podracer": "STAR_WARS_PODRACER.png",
     "subaru_wrx_sti": "SUBARU_WRX_STI.png",
     "tesla_roadster": "TESLA_ROADSTER.png",
-}
+})
 
 def validate_image_manifest(image_dir: str = "static/images"):
-    missing = []
-    for car, fname in CAR_IMAGE_MAP.items():
-        path = os.path.join(image_dir, fname)
-        if not os.path.isfile(path):
-            missing.append((car, fname))
+    # One directory read, a missing directory means every manifest entry is missing
+    try:
+        with os.scandir(image_dir) as entries:
+            existing = frozenset(entry.name for entry in entries if entry.is_file())
+    except FileNotFoundError:
+        existing = frozenset()
+    # Names not listed verbatim still get an isfile() check, which matches case insensitively where the filesystem does
+    missing = [(car, fname) for car, fname in CAR_IMAGE_MAP.items()
+               if fname not in existing and not os.path.isfile(os.path.join(image_dir, fname))]
     if missing:
         raise FileNotFoundError(f"Missing image files: {missing}")
 
@@ -1,18 +1,29 @@
-from unittest.mock import MagicMock
-sys.modules['bluepy'] = MagicMock()
-sys.modules['bluepy.btle'] = MagicMock()
+from types import SimpleNamespace
+
+import pytest
 
 from BluetoothConnector import connect_with_retry
 
-def test_connect_with_retry_success():
-    mock_peripheral = MagicMock()
-    with patch('bluepy.btle.Peripheral', return_value=mock_peripheral):
-        with patch('BluetoothConnector.Peripheral', return_value=mock_peripheral):
-            result = connect_with_retry('addr', 'addr_type', max_attempts=1, delay=0)
-            assert result is not None
-
-def test_connect_with_retry_failure():
-    with patch('bluepy.btle.Peripheral', side_effect=Exception("fail")):
-        with patch('BluetoothConnector.Peripheral', side_effect=Exception("fail")):
-            result = connect_with_retry('addr', 'addr_type', max_attempts=2, delay=0)
-            assert result is False
+DEVICE = SimpleNamespace(addr="addr")
+
+
+class TestBluetoothConnector:
+
+    def test_connect_with_retry_success(self, monkeypatch):
+        peripheral = object()
+        monkeypatch.setattr("BluetoothConnector.Peripheral", lambda addr, addrType: peripheral)
+        result = connect_with_retry(DEVICE, "addr_type", retries=1, delay=0)
+        assert result is peripheral
+
+    @pytest.mark.parametrize("retries", [1, 2])
+    def test_connect_with_retry_failure(self, monkeypatch, retries):
+        attempts = []
+
+        def failing_peripheral(addr, addrType):
+            attempts.append(addr)
+            raise Exception("fail")
+
+        monkeypatch.setattr("BluetoothConnector.Peripheral", failing_peripheral)
+        result = connect_with_retry(DEVICE, "addr_type", retries=retries, delay=0)
+        assert result is None
+        assert len(attempts) == retries
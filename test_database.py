@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+import pytz
+from freezegun import freeze_time
+
+import GlobalConstants as GC
+from Database import Database
+
+ENGINE_SOUNDS_TABLE = GC.DATABASE_TABLE_NAMES[GC.ENGINE_SOUNDS_TABLE]
+
+
+@pytest.fixture(scope="class")
+def db():
+    # Build the schema once per class, each xdist worker gets its own :memory: database
+    database = Database(":memory:")
+    yield database
+    database.close_database()
+
+
+@pytest.fixture(autouse=True)
+def empty_engine_sounds_table(db):
+    # Database methods commit as they go, so a SAVEPOINT rollback can't undo them, clear the rows instead
+    db.cursor.execute(f"DELETE FROM {ENGINE_SOUNDS_TABLE}")
+    db.commit_changes()
+
+
+def engine_sound_rows(db):
+    db.cursor.execute(f"SELECT id, filename, cost_in_cents FROM {ENGINE_SOUNDS_TABLE} ORDER BY id")
+    return db.cursor.fetchall()
+
+
+class TestDatabase:
+
+    def test_init_creates_tables(self):
+        db = Database(":memory:")
+        db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in db.cursor.fetchall()}
+        db.close_database()
+
+        for tableID in (GC.VEHICLES_TABLE, GC.USERS_TABLE, GC.ENGINE_SOUNDS_TABLE):
+            assert GC.DATABASE_TABLE_NAMES[tableID] in tables
+        assert "DebugLoggingTable" in tables
+
+    def test_setup_engine_sounds_tables(self, db):
+        db.setup_engine_sounds_tables()
+
+        rows = engine_sound_rows(db)
+        assert [row[1] for row in rows] == [asset.sound for asset in GC.VEHICLE_ASSETS]
+        assert all(row[2] == 0 for row in rows)
+        assert not db.conn.in_transaction
+
+    def test_setup_engine_sounds_tables_updates_existing_rows(self, db):
+        db.setup_engine_sounds_tables()
+        firstSound = GC.VEHICLE_ASSETS[0].sound
+        db.cursor.execute(f"UPDATE {ENGINE_SOUNDS_TABLE} SET cost_in_cents = 499 WHERE filename = ?", (firstSound,))
+        db.commit_changes()
+        rowsBefore = engine_sound_rows(db)
+
+        db.setup_engine_sounds_tables()
+
+        rowsAfter = engine_sound_rows(db)
+        assert [row[0] for row in rowsAfter] == [row[0] for row in rowsBefore]
+        assert all(row[2] == 0 for row in rowsAfter)
+
+    # Real pytz decides DST from the frozen clock, both instants are 12:00 in America/Chicago
+    @pytest.mark.parametrize("frozenUtc, expected", [
+        ("2023-01-15 18:00:00", datetime(2023, 1, 15, 12, 0, tzinfo=pytz.utc)),     # Standard Time
+        ("2023-06-15 17:00:00", datetime(2023, 6, 15, 12, 0, tzinfo=pytz.utc)),     # Daylight Savings
+    ])
+    def test_get_date_time(self, db, frozenUtc, expected):
+        with freeze_time(frozenUtc):
+            assert db.get_date_time() == expected
@@ -1,14 +1,153 @@
+import os
 import unittest
-from unittest.mock import patch
-from EngineSoundPitchShifter import example_pitch_shift
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+import EngineSoundPitchShifter as ESPS
+import GlobalConstants as GC
+from EngineSoundPitchShifter import EngineSoundPitchShifter, _resample_block
+
+@dataclass(frozen=True, slots=True)
+class MockKey:
+    """ Stand-in for a pynput keyboard key, char is None for special keys like Esc
+    """
+    char: Optional[str] = None
+    name: Optional[str] = None
+
+RESAMPLERS = (_resample_block, ESPS._resample_block_loop, ESPS._resample_block_numpy)
+
+# One second of real float32 audio, so constructor tests run the playback code on numpy arrays instead of mocks
+DUMMY_AUDIO = np.linspace(-1.0, 1.0, 44100, dtype=np.float32)
 
 class TestEngineSoundPitchShifter(unittest.TestCase):
 
-    @patch('EngineSoundPitchShifter.peek')
-    def test_example_pitch_shift_runs(self, mock_peek):
-        dummy_data = [1, 2, 3]
-        result = example_pitch_shift(dummy_data, 1.2)
-        assert result == dummy_data
+    def test_resample_block_unity_pitch_copies_audio(self):
+        audio = np.arange(8, dtype=np.float32)
+        for resample in RESAMPLERS:
+            with self.subTest(resample.__name__):
+                out = np.empty(4, dtype=np.float32)
+                nextFrame = resample(audio, out, 2.0, 1.0)
+                np.testing.assert_array_equal(out, audio[2:6])
+                assert nextFrame == 6.0
+
+    def test_resample_block_interpolates_and_zero_pads(self):
+        audio = np.arange(8, dtype=np.float32)
+        for resample in RESAMPLERS:
+            with self.subTest(resample.__name__):
+                out = np.empty(4, dtype=np.float32)
+                nextFrame = resample(audio, out, 4.0, 1.5)
+                np.testing.assert_array_equal(out, [4.0, 5.5, 7.0, 0.0])
+                assert nextFrame == 10.0
+
+    def test_resample_block_numpy_matches_loop(self):
+        audio = np.random.default_rng(0).standard_normal(1000).astype(np.float32)
+        expected = np.empty(GC.AUDIO_BLOCK_SIZE, dtype=np.float32)
+        actual = np.empty(GC.AUDIO_BLOCK_SIZE, dtype=np.float32)
+        ESPS._resample_block_loop(audio, expected, 3.25, 0.37)
+        ESPS._resample_block_numpy(audio, actual, 3.25, 0.37)
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+
+class TestEngineSoundPitchShifterConstructor(unittest.TestCase):
+
+    # Stand-ins for pynput key events, a character key and a special key
+    _W_KEY = MockKey(char='w')
+    _UPPER_W_KEY = MockKey(char='W')
+    _ESC_KEY = MockKey(name='esc')
+
+    def setUp(self):
+        ESPS._PCM_CACHE.clear()
+
+        # Shared by every constructor test, mono 44.1 kHz audio unless a test overrides audioFile
+        self.mock_sd = self.start_patch('EngineSoundPitchShifter.sd')
+        self.mock_sf = self.start_patch('EngineSoundPitchShifter.sf')
+        self.audioFile = self.mock_sf.SoundFile.return_value.__enter__.return_value
+        self.audioFile.samplerate = 44100
+        self.audioFile.frames = len(DUMMY_AUDIO)
+        self.audioFile.channels = 1
+        self.audioFile.read.side_effect = self.read_dummy_audio
+
+    @staticmethod
+    def read_dummy_audio(dtype, out):
+        # Like SoundFile.read(), fill out and return the part of it holding decoded frames
+        frames = min(len(out), len(DUMMY_AUDIO))
+        out[:frames] = DUMMY_AUDIO[:frames]
+        return out if frames == len(out) else out[:frames]
+
+    def start_patch(self, target):
+        patcher = patch(target, create=True)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_constructor_loads_native_rate_mono_audio(self):
+        self.audioFile.samplerate = 48000
+        self.audioFile.frames = 4
+        self.audioFile.channels = 2
+        stereo = np.array([[1, 3], [2, 4], [5, 7], [6, 8]], dtype=np.float32)
+        self.audioFile.blocks.return_value = [stereo[:2], stereo[2:]]
+
+        shifter = EngineSoundPitchShifter(GC.MC_LAREN_F1)
+
+        self.mock_sf.SoundFile.assert_called_once_with(shifter.audioFilepath)
+        assert shifter.audioFilepath.endswith(os.path.join("static", "sounds", "McLarenF1.wav"))
+        np.testing.assert_array_equal(shifter.audioTimeSeries, [2, 3, 6, 7])
+        assert shifter.sampleRate == 48000
+        streamArgs = self.mock_sd.OutputStream.call_args.kwargs
+        assert streamArgs['samplerate'] == 48000
+        assert streamArgs['blocksize'] == GC.AUDIO_BLOCK_SIZE
+        assert streamArgs['dtype'] == 'float32'
+
+    def test_constructor_drops_frames_missing_from_a_short_read(self):
+        self.audioFile.frames = len(DUMMY_AUDIO) + 100
+
+        shifter = EngineSoundPitchShifter(GC.MC_LAREN_F1)
+
+        np.testing.assert_array_equal(shifter.audioTimeSeries, DUMMY_AUDIO)
+
+    def test_constructor_decodes_each_sound_once(self):
+        first = EngineSoundPitchShifter(GC.MC_LAREN_F1)
+        second = EngineSoundPitchShifter(GC.MC_LAREN_F1)
+
+        self.audioFile.read.assert_called_once_with(dtype='float32', out=first.audioTimeSeries)
+        assert second.audioTimeSeries is first.audioTimeSeries
+
+    def test_on_press_and_release(self):
+        shifter = EngineSoundPitchShifter(GC.MC_LAREN_F1)
+
+        for key in (self._W_KEY, self._UPPER_W_KEY):
+            shifter.on_press(key)
+            assert shifter.isWPressed
+            shifter.on_release(key)
+            assert not shifter.isWPressed
+
+        # Special keys have no char and must be ignored
+        shifter.on_press(self._ESC_KEY)
+        shifter.on_release(self._ESC_KEY)
+        assert not shifter.isWPressed
+
+    def test_w_press_revs_gas_pedal(self):
+        shifter = EngineSoundPitchShifter(GC.MC_LAREN_F1)
+        shifter.on_press(self._W_KEY)
+
+        # Run exactly one step of the gas pedal loop
+        shifter.stopEvent = MagicMock()
+        shifter.stopEvent.wait.side_effect = [False, True]
+        shifter.simulate_gas_pedal()
+
+        assert shifter.pitchFactor == 1.02
+
+    def test_audio_callback_plays_decoded_audio(self):
+        shifter = EngineSoundPitchShifter(GC.MC_LAREN_F1)
+        shifter.playing = True
+        outdata = np.empty((GC.AUDIO_BLOCK_SIZE, 1), dtype=np.float32)
+
+        shifter.audio_callback(outdata, GC.AUDIO_BLOCK_SIZE, None, None)
+
+        np.testing.assert_array_equal(outdata[:, 0], DUMMY_AUDIO[:GC.AUDIO_BLOCK_SIZE])
+        assert shifter.currentFrame == GC.AUDIO_BLOCK_SIZE
 
 if __name__ == '__main__':
     unittest.main()
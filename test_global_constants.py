@@ -1,11 +1,71 @@
+import os
+
+import pytest
+
 import GlobalConstants as GC
 
-def test_car_asset_fields():
-    asset = GC.CarAsset("test", "image.png", "sound.mp3")
+def test_vehicle_asset_fields():
+    asset = GC.VehicleAsset("99", "test", "image.png", "sound.wav")
+    assert asset.engineSoundID == "99"
     assert asset.name == "test"
     assert asset.image == "image.png"
-    assert asset.sound == "sound.mp3"
+    assert asset.sound == "sound.wav"
+    assert not hasattr(asset, "__dict__")
+    assert asset == GC.VehicleAsset("99", "test", "image.png", "sound.wav")
+    assert len({asset, GC.VehicleAsset("99", "test", "image.png", "sound.wav")}) == 1
+
+def test_vehicle_assets_list():
+    assert isinstance(GC.VEHICLE_ASSETS, list)
+    assert all(isinstance(a, GC.VehicleAsset) for a in GC.VEHICLE_ASSETS)
+
+def create_asset_files(paths):
+    for path in paths:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+
+def test_validate_assets_runs_successfully_when_files_exist(tmp_path, monkeypatch):
+    GC._find_missing_assets.cache_clear()
+    monkeypatch.chdir(tmp_path)
+    create_asset_files(GC.IMAGE_PATHS + GC.SOUND_PATHS)
+    GC.validate_assets()
+
+def test_validate_assets_reports_missing_files(tmp_path, monkeypatch):
+    GC._find_missing_assets.cache_clear()
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("static/images")
+    open(GC.VEHICLE_ASSETS[0].image, "w").close()
+    with pytest.raises(FileNotFoundError) as excinfo:
+        GC.validate_assets()
+    assert GC.VEHICLE_ASSETS[0].image not in str(excinfo.value)
+    assert GC.VEHICLE_ASSETS[0].sound in str(excinfo.value)
+
+def test_validate_assets_rescans_only_after_a_directory_changes(tmp_path, monkeypatch):
+    GC._find_missing_assets.cache_clear()
+    monkeypatch.chdir(tmp_path)
+    create_asset_files(GC.IMAGE_PATHS + GC.SOUND_PATHS[1:])
+    with pytest.raises(FileNotFoundError):
+        GC.validate_assets()
+    with pytest.raises(FileNotFoundError):
+        GC.validate_assets()
+    assert GC._find_missing_assets.cache_info().hits == 1
+
+    # Bump the directory mtime explicitly, since coarse filesystem clocks may not tick between calls
+    create_asset_files(GC.SOUND_PATHS[:1])
+    soundDirectory = os.path.dirname(GC.SOUND_PATHS[0])
+    mtime = os.stat(soundDirectory).st_mtime_ns + 1_000_000
+    os.utime(soundDirectory, ns=(mtime, mtime))
+    GC.validate_assets()
+
+def test_asset_path_tuples_match_vehicle_assets():
+    assert GC.IMAGE_PATHS == tuple(asset.image for asset in GC.VEHICLE_ASSETS)
+    assert GC.SOUND_PATHS == tuple(asset.sound for asset in GC.VEHICLE_ASSETS)
+    assert "McLaren F1" in GC.ASSET_NAMES
+
+def test_sound_file_extensions_are_wav():
+    assert all(sound.endswith(".wav") for sound in GC.SOUND_PATHS)
+    assert all(image.endswith(".png") for image in GC.IMAGE_PATHS)
 
-def test_car_assets_list():
-    assert isinstance(GC.CAR_ASSETS, list)
-    assert all(isinstance(a, GC.CarAsset) for a in GC.CAR_ASSETS)
+def test_vehicle_asset_paths_use_asset_roots():
+    assert all(image.startswith(GC.IMAGE_ROOT) for image in GC.IMAGE_PATHS)
+    assert all(sound.startswith(GC.SOUND_ROOT) for sound in GC.SOUND_PATHS)
+    assert all(os.sep in path for path in GC.IMAGE_PATHS + GC.SOUND_PATHS)
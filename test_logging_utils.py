@@ -1,3 +1,7 @@
+import importlib
+import logging
+
+import logging_utils
 from logging_utils import log_info, log_warning, log_error
 
 def test_log_info():
@@ -11,3 +15,21 @@ def test_log_warning():
 def test_log_error():
     log_error("Test error message")
     assert True
+
+def test_reload_does_not_duplicate_handlers():
+    handler_count = len(logging_utils.logger.handlers)
+    importlib.reload(logging_utils)
+    assert len(logging_utils.logger.handlers) == handler_count
+
+def test_reload_keeps_caller_log_level():
+    logging_utils.logger.setLevel(logging.WARNING)
+    try:
+        importlib.reload(logging_utils)
+        assert logging_utils.logger.level == logging.WARNING
+    finally:
+        logging_utils.logger.setLevel(logging.INFO)
+
+def test_log_info_formats_args(caplog):
+    with caplog.at_level("INFO", logger="dmuffler"):
+        log_info("Engine sound changed to %s", "McLarenF1.wav")
+    assert "Engine sound changed to McLarenF1.wav" in caplog.text
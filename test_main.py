@@ -1,25 +1,122 @@
-import unittest
-from unittest.mock import patch
-from Main import play_external_audio, demo_delay
-
-class TestMainFunctions(unittest.TestCase):
-
-    @patch('subprocess.Popen')
-    def test_play_external_audio_runs(self, mock_popen):
-        # This test only checks that the function runs without error for a dummy file
-        # Replace 'dummy.mp3' with a real file path for integration testing
-        play_external_audio('dummy.mp3')
-        mock_popen.assert_called_once()
-
-    @patch('time.sleep')
-    def test_demo_delay(self, mock_sleep):
-        start = time.time()
-        demo_delay(0.1)
-        mock_sleep.assert_called_once_with(0.1)
-        assert time.time() - start < 0.1  # since sleep is mocked, time shouldn't pass
+import builtins
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock, call
+
+import pytest
+
+import GlobalConstants as GC
+import Main
+from Database import Database
+
+# Public attribute names of Database, used as the spec of Database mocks
+_DB_SPEC = [name for name in dir(Database) if not name.startswith('__')]
+
+# Command line for each --mode, parsed by run()'s real ArgumentParser
+_ARGV_DEV = ['Main.py', '--mode', 'DEV']
+_ARGV_TESTING = ['Main.py', '--mode', 'TESTING']
+_ARGV_PRODUCTION = ['Main.py', '--mode', 'PRODUCTION']
+
+_EXPECTED_DB_INIT_CALLS = [call("DMufflerLocalDev.db"), call("DMufflerDatabase.db")]
+
+_EXPECTED_INPUT_CALLS = [
+    call("Please enter first name to add new user: "),
+    call("Please enter VIN to add vehicle to an existing user: "),
+    call("Please enter the color (6 digit HEX code if possible) of vehicle: "),
+]
+
+
+@pytest.fixture(scope="module")
+def mock_dev_db():
+    return Mock(spec=_DB_SPEC)
+
+
+@pytest.fixture(scope="module")
+def mock_prod_db():
+    return Mock(spec=_DB_SPEC)
+
+
+@pytest.fixture(scope="module")
+def mock_vehicle():
+    # Main only reads these three attributes off the decoded VIN, so a plain namespace is enough
+    return SimpleNamespace(Make="TestMake", Model="TestModel", ModelYear="2023")
+
+
+@pytest.fixture
+def database_mock(mock_dev_db, mock_prod_db):
+    """ Database constructor that returns the dev then the production database, in the order run() opens them
+    """
+    constructor = Mock(side_effect=[mock_dev_db, mock_prod_db])
+    constructor.dev, constructor.prod = mock_dev_db, mock_prod_db
+    return constructor
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_mocks(mock_dev_db, mock_prod_db):
+    # The mocks above are built once per module, so clear the calls recorded by the previous test
+    for mock in (mock_dev_db, mock_prod_db):
+        mock.reset_mock()
+
+
+class TestMainExecution:
+
+    def test_main_integration_test_function(self, monkeypatch, mock_dev_db):
+        mock_esps = Mock()
+        monkeypatch.setattr(Main, 'ESPS', mock_esps)
+        Main.integration_test(mock_dev_db)
+        mock_esps.assert_called_once_with(GC.MC_LAREN_F1)
+        mock_esps.return_value.unit_test.assert_called_once()
+        assert not mock_dev_db.mock_calls
+
+    def test_main_function_pass_through(self, mock_prod_db):
+        assert Main.main(mock_prod_db) is None
+
+    @pytest.mark.parametrize("argv, banner, color, expected_callee", [
+        (_ARGV_DEV, "DMuffler booting in DEV mode", "red", None),
+        (_ARGV_TESTING, "DMuffler booting in TESTING mode", "red", "integration_test"),
+        (_ARGV_PRODUCTION, "DMuffler booting in standard PRODUCTION mode", "green", "main"),
+    ], ids=["DEV", "TESTING", "PRODUCTION"])
+    def test_mode(self, monkeypatch, database_mock, mock_vehicle, argv, banner, color, expected_callee):
+        mock_input = Mock(side_effect=["Alice", " 1hgcm82633a004352 ", "FF0000"])
+        mock_vin = Mock(return_value=mock_vehicle)
+        mock_peek = Mock()
+        callees = {
+            'integration_test': (Mock(), database_mock.dev),
+            'main': (Mock(), database_mock.prod),
+        }
+        monkeypatch.setattr(Main, 'Database', database_mock)
+        monkeypatch.setattr(builtins, 'input', mock_input)
+        monkeypatch.setattr(Main, 'VIN', mock_vin)
+        monkeypatch.setattr(Main, 'peek', mock_peek)
+        for name, (mock_callee, _) in callees.items():
+            monkeypatch.setattr(Main, name, mock_callee)
+        monkeypatch.setattr(sys, 'argv', argv)
+
+        Main.run()
+
+        database_mock.assert_has_calls(_EXPECTED_DB_INIT_CALLS)
+
+        if expected_callee is None:
+            # DEV mode prompts for a new user and vehicle instead of handing off to another function
+            mock_peek.peek.assert_called_once_with(banner, color=color)
+            mock_input.assert_has_calls(_EXPECTED_INPUT_CALLS)
+            mock_vin.assert_called_once_with("1HGCM82633A004352")
+            mock_peek.assert_called_once_with("Make: TestMake, Model: TestModel, Year: 2023")
+        else:
+            mock_peek.assert_called_once_with(banner, color=color)
+            mock_input.assert_not_called()
+
+        for name, (mock_callee, db) in callees.items():
+            if name == expected_callee:
+                mock_callee.assert_called_once_with(db)
+            else:
+                mock_callee.assert_not_called()
+
 
 if __name__ == '__main__':
-    unittest.main()
-    from Main import demo_delay
-    demo_delay(0.1)
-    assert time.time() - start >= 0.1
+    # Quiet output with capture off when run standalone, FAILFAST=1 stops at the first failure in CI smoke runs
+    args = [__file__, '-q', '--capture=no']
+    if os.getenv('FAILFAST'):
+        args.append('-x')
+    sys.exit(pytest.main(args))